@@ -1,16 +1,32 @@
 from celery.result import AsyncResult
-from fastapi import APIRouter
-from app.schemas.analysis import AnalysisRequest, AnalysisResponse, TaskStatusResponse
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from app.schemas.analysis import AnalysisRequest, AnalysisResponse, ReportDiffResponse, TaskStatusResponse
 from app.tasks.analysis import run_analysis_task
 from app.tasks.analysis import celery
+from app.config import settings
+from app.core.cancellation import request_cancel
+from app.core.event_bus import event_bus
+from app.core.report_diff import diff_reports
+from app.core.report_store import report_store
+from app.core.snapshots import snapshot_store
+from app.core.status_index import status_index, status_notifier, TERMINAL_STATES
+import asyncio
+import time
 import uuid
+import redis
 
 router = APIRouter()
 
 @router.post("/start", response_model=AnalysisResponse)
 async def start_analysis(request: AnalysisRequest):
     try:
+        # Serve popular requests straight from a fresh precomputed snapshot
+        snapshot_task_id = get_fresh_snapshot(request.dict())
+        if snapshot_task_id:
+            return {"task_id": snapshot_task_id, "cached": True}
+
         task_id = str(uuid.uuid4())
+        status_index.update(task_id, "PENDING")
         run_analysis_task.apply_async(
             args=["anonymous", request.dict()],
             task_id=task_id
@@ -19,20 +35,156 @@ async def start_analysis(request: AnalysisRequest):
     except Exception as e:
         return {"task_id": None}
 
-@router.get("/status/{task_id}", response_model=TaskStatusResponse)
-async def get_task_status(task_id: str):
+def get_fresh_snapshot(params: dict) -> str | None:
+    try:
+        key = snapshot_store.record_request(params)
+        task_id = snapshot_store.get_fresh(key)
+    except Exception as e:
+        print(f"Error reading snapshots: {e}")
+        return None
+    if task_id is None:
+        return None
+    record = status_index.get(task_id)
+    return task_id if record and record["status"] == "SUCCESS" else None
+
+def get_celery_record(task_id: str) -> dict:
     result = AsyncResult(task_id, app=celery)
-    
-    response = {
+    record = {"status": result.status}
+    if record["status"] == "FAILURE":
+        record["error"] = str(result.result)
+    elif record["status"] == "REVOKED":
+        record["error"] = "Analysis cancelled"
+    elif record["status"] == "SUCCESS":
+        record.update(result.result)
+    return record
+
+def get_status_record(task_id: str) -> dict:
+    """Read the status index, falling back to the Celery result backend"""
+    try:
+        record = status_index.get(task_id)
+    except redis.RedisError as e:
+        print(f"Error reading status index: {e}")
+        return get_celery_record(task_id)
+    if record is None:
+        return get_celery_record(task_id)
+
+    stale = time.time() - record.get("updated_at", 0) > settings.STATUS_STALE_SECONDS
+    if record["status"] not in TERMINAL_STATES and stale:
+        # A lost or killed worker never writes its final state; Celery may
+        # still have recorded it, so copy it into the index
+        celery_record = get_celery_record(task_id)
+        if celery_record["status"] in TERMINAL_STATES:
+            fields = {key: value for key, value in celery_record.items() if key != "status"}
+            try:
+                status_index.finish(task_id, celery_record["status"], **fields)
+            except redis.RedisError as e:
+                print(f"Error updating status index: {e}")
+            return celery_record
+    return record
+
+async def wait_for_transition(task_id: str, record: dict, timeout: float) -> dict:
+    """Long-poll: return as soon as the worker records a new transition"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    waiter = status_notifier.register(task_id)
+    try:
+        if not await status_notifier.wait_ready(timeout):
+            return record
+        # Read again now that we are subscribed, so a transition since the
+        # first read is not missed
+        latest = get_status_record(task_id)
+        if latest.get("version") != record.get("version") or latest["status"] in TERMINAL_STATES:
+            return latest
+        if await status_notifier.wait(waiter, deadline - loop.time()):
+            return get_status_record(task_id)
+        return latest
+    finally:
+        status_notifier.unregister(task_id, waiter)
+
+@router.get("/status/{task_id}", response_model=TaskStatusResponse)
+async def get_task_status(
+    task_id: str,
+    request: Request,
+    response: Response,
+    wait: int = Query(0, ge=0, description="Seconds to wait for a status change")
+):
+    record = get_status_record(task_id)
+
+    if wait and record["status"] not in TERMINAL_STATES:
+        record = await wait_for_transition(task_id, record, min(wait, settings.STATUS_MAX_WAIT_SECONDS))
+
+    response_data = {
         "task_id": task_id,
-        "status": result.status,
+        "status": record["status"],
         "result": None,
-        "error": None
+        "error": record.get("error")
+    }
+
+    if record["status"] == "SUCCESS":
+        task_result = {"summary": record.get("summary"), "task": "success", "result": record.get("result")}
+        report_ref = record.get("report")
+        if report_ref:
+            # The report digest doubles as a strong ETag
+            etag = f'"{report_ref["digest"]}"'
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+            task_result["report"] = report_ref
+            try:
+                task_result["result"] = report_store.load(task_id)
+                if task_result["result"] is None:
+                    response_data["error"] = "Report has expired"
+                response.headers["ETag"] = etag
+            except Exception as e:
+                # Not cached under the ETag, so the client retries for real
+                print(f"Error loading report: {e}")
+                response_data["error"] = "Report is temporarily unavailable"
+        response_data["result"] = task_result
+
+    return response_data
+
+@router.get("/report/{task_id}", response_model=ReportDiffResponse)
+async def get_report_changes(
+    task_id: str,
+    since: str | None = Query(None, description="Report version the client already has")
+):
+    version = report_store.get_digest(task_id)
+    report = report_store.load_version(version) if version else None
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    # Without a usable base version every section is sent as added
+    if since == version:
+        previous = report
+    else:
+        previous = report_store.load_version(since) if since else None
+    changes = diff_reports(previous, report)
+    return {
+        "task_id": task_id,
+        "version": version,
+        "base_version": since if previous is not None else None,
+        **changes
     }
 
-    if result.failed():
-        response["error"] = str(result.result)
-    elif result.successful():
-        response["result"] = result.result
+@router.delete("/{task_id}", response_model=TaskStatusResponse)
+async def cancel_analysis(task_id: str, response: Response):
+    record = status_index.get(task_id)
+    if record is None:
+        # /start always indexes its tasks; Celery reports unknown ids as PENDING
+        record = get_celery_record(task_id)
+        if record["status"] == "PENDING":
+            raise HTTPException(status_code=404, detail="Task not found")
+    if record["status"] in TERMINAL_STATES:
+        raise HTTPException(status_code=409, detail=f"Task already {record['status'].lower()}")
+
+    # Running workers notice the flag at their next agent step or tool call
+    # and record the final state themselves; queued tasks are revoked so a
+    # worker never picks them up
+    request_cancel(task_id)
+    celery.control.revoke(task_id)
+    if record["status"] != "PENDING":
+        response.status_code = 202
+        return {"task_id": task_id, "status": record["status"], "result": None, "error": None}
 
-    return response
\ No newline at end of file
+    status_index.update(task_id, "REVOKED", error="Analysis cancelled")
+    event_bus.publish(task_id, {"type": "CREW_CANCELLED", "data": {"reason": "Analysis cancelled"}})
+    return {"task_id": task_id, "status": "REVOKED", "result": None, "error": "Analysis cancelled"}
@@ -0,0 +1,139 @@
+import asyncio
+import json
+from collections import defaultdict
+import redis.asyncio as aioredis
+import socketio
+from app.config import settings
+
+WATCH_TTL = 15
+WATCH_INTERVAL = 5
+
+
+class EventHub:
+    """Socket.IO endpoint for clients watching many analyses at once.
+
+    Clients emit ``subscribe`` with ``task_ids``, ``batch_ids`` and an
+    optional list of event ``types``. Every process keeps a single pattern
+    subscription on ``events:*`` and fans matching events out to its
+    clients, so Redis connections stay flat however many tasks are watched.
+    """
+
+    def __init__(self):
+        origins = settings.BACKEND_CORS_ORIGINS
+        self.sio = socketio.AsyncServer(
+            async_mode="asgi",
+            cors_allowed_origins="*" if "*" in origins else origins
+        )
+        # "task:{id}" / "batch:{id}" -> {sid: set of event types, or None for all}
+        self.subscriptions = defaultdict(dict)
+        self.redis = None
+        self._tasks = []
+
+        self.sio.on("subscribe", self.subscribe)
+        self.sio.on("unsubscribe", self.unsubscribe)
+        self.sio.on("disconnect", self.disconnect)
+
+    def _parse(self, data) -> tuple[list[str], set[str] | None]:
+        """Subscription keys and event types of a request; raises ValueError"""
+        if not isinstance(data, dict):
+            raise ValueError("Payload must be an object")
+        fields = {}
+        for field in ("task_ids", "batch_ids", "types"):
+            values = data.get(field) or []
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                raise ValueError(f"{field} must be a list of strings")
+            fields[field] = values
+        keys = (
+            [f"task:{task_id}" for task_id in fields["task_ids"]]
+            + [f"batch:{batch_id}" for batch_id in fields["batch_ids"]]
+        )
+        return keys, set(fields["types"]) or None
+
+    async def subscribe(self, sid: str, data: dict):
+        try:
+            keys, types = self._parse(data)
+        except ValueError as e:
+            return {"error": str(e)}
+        for key in keys:
+            self.subscriptions[key][sid] = types
+        self.start()
+        return {"subscribed": keys}
+
+    async def unsubscribe(self, sid: str, data: dict):
+        try:
+            keys, _ = self._parse(data)
+        except ValueError as e:
+            return {"error": str(e)}
+        for key in keys:
+            self._remove(key, sid)
+        return {"unsubscribed": keys}
+
+    async def disconnect(self, sid: str):
+        for key in list(self.subscriptions):
+            self._remove(key, sid)
+
+    def _remove(self, key: str, sid: str):
+        watchers = self.subscriptions.get(key)
+        if watchers is not None:
+            watchers.pop(sid, None)
+            if not watchers:
+                del self.subscriptions[key]
+
+    def start(self):
+        """Start the shared Redis subscriber on first use in this process"""
+        if not self._tasks:
+            self.redis = aioredis.from_url(settings.EVENT_BUS_URL)
+            self._tasks = [
+                asyncio.create_task(self.listen()),
+                asyncio.create_task(self.heartbeat())
+            ]
+
+    async def listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.psubscribe("events:*")
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        task_id = message["channel"].decode("utf-8")[len("events:"):]
+                        await self.dispatch(task_id, message["data"])
+            except Exception as e:
+                print(f"Error in event hub subscriber: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def dispatch(self, task_id: str, raw: bytes):
+        try:
+            event = json.loads(raw)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return
+
+        keys = [f"task:{task_id}"]
+        if event.get("batch_id"):
+            keys.append(f"batch:{event['batch_id']}")
+        sids = {
+            sid
+            for key in keys
+            for sid, types in self.subscriptions.get(key, {}).items()
+            if types is None or event.get("type") in types
+        }
+        payload = {"task_id": task_id, **event}
+        for sid in sids:
+            await self.sio.emit("event", payload, to=sid)
+
+    async def heartbeat(self):
+        """Mark watched tasks and batches so workers know someone is listening"""
+        while True:
+            try:
+                if self.subscriptions:
+                    pipe = self.redis.pipeline()
+                    for key in list(self.subscriptions):
+                        pipe.set(f"watchers:{key}", 1, ex=WATCH_TTL)
+                    await pipe.execute()
+            except Exception as e:
+                print(f"Error refreshing watchers: {e}")
+            await asyncio.sleep(WATCH_INTERVAL)
+
+
+event_hub = EventHub()
@@ -6,7 +6,31 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    CELERY_RESULT_EXPIRES: int = 60 * 60 * 24
     EVENT_BUS_URL: str = "redis://localhost:6379/1"
+    REPORT_STORE_URL: str = "redis://localhost:6379/2"
+    REPORT_TTL_SECONDS: int = 60 * 60 * 24 * 7
+    STATUS_INDEX_URL: str = "redis://localhost:6379/1"
+    STATUS_TTL_SECONDS: int = 60 * 60 * 24 * 7
+    STATUS_MAX_WAIT_SECONDS: int = 30
+    STATUS_STALE_SECONDS: int = 120
+    ANALYSIS_DEADLINE_SECONDS: int = 60 * 30
+    CANCEL_WITHOUT_SUBSCRIBER_SECONDS: int = 0
+    SNAPSHOT_STORE_URL: str = "redis://localhost:6379/2"
+    SNAPSHOT_MAX_AGE_SECONDS: int = 60 * 60 * 24
+    SNAPSHOT_HOT_SET_SIZE: int = 30
+    SNAPSHOT_MAX_RUNS: int = 20
+    SNAPSHOT_HOUR: int = 3
+    CASSETTE_MODE: str = ""
+    CASSETTE_DIR: str = "cassettes"
+    CASSETTE_REPLAY_PATH: str = ""
+    CASSETTE_REPLAY_LATENCY: float = 0.0
+    CASSETTE_REPLAY_STRICT: bool = False
+    # Frames per traced allocation; above 0 turns on tracemalloc diagnostics
+    RESOURCE_TRACE_FRAMES: int = 0
+    RESOURCE_DUMP_THRESHOLD_MB: int = 0
+    RESOURCE_DUMP_DIR: str = "diagnostics"
+    WORKER_MAX_MEMORY_GROWTH_MB: int = 512
     TAVILY_API_KEY: str = ""
     OPENAI_API_KEY: str = ""
     
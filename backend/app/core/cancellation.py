@@ -0,0 +1,96 @@
+import time
+import redis
+from app.config import settings
+from app.core.event_bus import event_bus
+
+
+try:
+    # crewai lets HookAborted through its retry loop and executor-thread
+    # wrapping, so deriving from it stops the crew at the first check
+    from crewai.hooks.dispatch import HookAborted as _StopBase
+except ImportError:
+    _StopBase = Exception
+
+
+class AnalysisCancelled(_StopBase):
+    """Raised inside a running crew when its analysis should stop"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def find_cancellation(exc: BaseException) -> AnalysisCancelled | None:
+    """Return the AnalysisCancelled an exception was raised from, if any.
+
+    crewai may wrap errors from agent threads (e.g. in RuntimeError), so
+    the cause and context chain is followed.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, AnalysisCancelled):
+            return exc
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+
+def request_cancel(task_id: str):
+    """Flag a running analysis for cancellation"""
+    if event_bus.redis is None:
+        event_bus.connect()
+    event_bus.redis.set(f"cancel:{task_id}", 1, ex=settings.ANALYSIS_DEADLINE_SECONDS or 60 * 60)
+
+
+class CancellationToken:
+    """Checked at agent-step and tool-call boundaries of a running analysis.
+
+    Stops the run when it has been cancelled through the API, when the
+    overall deadline has passed, or (optionally) when nobody has been
+    subscribed to its event channel for ``idle_timeout`` seconds.
+    """
+
+    def __init__(self, task_id: str, deadline_seconds: int = 0, idle_timeout: int = 0, batch_id: str = None):
+        self.task_id = task_id
+        # Socket.IO watchers share one pattern subscription per process, so
+        # they show up as heartbeat keys rather than channel subscribers
+        self.watch_keys = [f"watchers:task:{task_id}"]
+        if batch_id:
+            self.watch_keys.append(f"watchers:batch:{batch_id}")
+        now = time.monotonic()
+        self.deadline = now + deadline_seconds if deadline_seconds else None
+        self.idle_timeout = idle_timeout
+        self.last_subscriber_seen = now
+        # Set once the token trips. Framework code may swallow or wrap the
+        # exception, so callers check this rather than the exception type
+        self.reason = None
+
+    def cancel(self, reason: str):
+        self.reason = reason
+        raise AnalysisCancelled(reason)
+
+    def check(self):
+        if self.reason is not None:
+            # Stay tripped, e.g. if crewai retries the step after a wrapped error
+            raise AnalysisCancelled(self.reason)
+
+        now = time.monotonic()
+        if self.deadline is not None and now > self.deadline:
+            self.cancel("Analysis deadline exceeded")
+
+        try:
+            if event_bus.redis is None:
+                event_bus.connect()
+            if event_bus.redis.exists(f"cancel:{self.task_id}"):
+                self.cancel("Analysis cancelled")
+
+            if self.idle_timeout:
+                channel = f"events:{self.task_id}"
+                [(_, subscribers)] = event_bus.redis.pubsub_numsub(channel)
+                if subscribers or event_bus.redis.exists(*self.watch_keys):
+                    self.last_subscriber_seen = now
+                elif now - self.last_subscriber_seen > self.idle_timeout:
+                    self.cancel("No event subscribers, analysis abandoned")
+        except redis.RedisError as e:
+            # Never kill an analysis just because the flag store is unavailable
+            print(f"Error checking cancellation: {e}")
@@ -0,0 +1,212 @@
+import gzip
+import hashlib
+import json
+import functools
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+class CassetteError(Exception):
+    """Raised when a replayed run asks for a call the cassette does not have"""
+
+
+def request_key(request: dict) -> str:
+    """Short hash identifying a call, used to check replays match the recording"""
+    raw = json.dumps(request, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+class Cassette:
+    """Captures LLM and search calls of a crew run, or serves them back.
+
+    In ``record`` mode every call goes through to the real service and its
+    request, response and duration are appended to the cassette. In
+    ``replay`` mode calls are answered from the cassette in the order they
+    were recorded (per kind of call), sleeping ``latency`` times the
+    original duration, so replays need no external services at all. A
+    replayed call whose request differs from the recorded one is reported,
+    and raises ``CassetteError`` when ``strict`` is set.
+    """
+
+    def __init__(self, path: str, mode: str = "record", latency: float = 0.0, strict: bool = False):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.strict = strict
+        self.mismatches = 0
+        self.entries = []
+        self.metadata = {}
+        self._queues = defaultdict(deque)
+        if mode == "replay":
+            self.load()
+
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        self.metadata = data.get("metadata", {})
+        self.entries = data["entries"]
+        for entry in self.entries:
+            self._queues[entry["kind"]].append(entry)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump({"version": 1, "metadata": self.metadata, "entries": self.entries}, f, default=str)
+
+    def call(self, kind: str, request: dict, fn, encode=None, decode=None):
+        """Run ``fn`` (record) or answer from the cassette (replay)"""
+        if self.mode == "replay":
+            if not self._queues[kind]:
+                raise CassetteError(f"No recorded {kind} call left to replay")
+            entry = self._queues[kind].popleft()
+            if entry.get("key") != request_key(request):
+                self.mismatches += 1
+                message = f"Replayed {kind} call does not match the recording: {request}"
+                if self.strict:
+                    raise CassetteError(message)
+                print(f"Warning: {message}")
+            if self.latency:
+                time.sleep(entry["duration"] * self.latency)
+            return decode(entry["response"]) if decode else entry["response"]
+
+        started = time.perf_counter()
+        response = fn()
+        self.entries.append({
+            "kind": kind,
+            "key": request_key(request),
+            "request": request,
+            "response": encode(response) if encode else response,
+            "duration": round(time.perf_counter() - started, 4),
+        })
+        return response
+
+
+# Cassette of the crew run in this process. A plain global because crewai
+# runs time-limited agents in executor threads.
+_active_cassette: Cassette | None = None
+
+
+def current_cassette() -> Cassette | None:
+    return _active_cassette
+
+
+_in_llm_call = threading.local()
+
+
+def _encode_llm_response(response):
+    """JSON-friendly form of an LLM response.
+
+    Native function calling returns provider tool-call objects; they are
+    stored as dicts, which crewai accepts as tool calls too.
+    """
+    if isinstance(response, list):
+        return [_encode_llm_response(item) for item in response]
+    if hasattr(response, "model_dump"):
+        return response.model_dump(mode="json")
+    return response
+
+
+def _decode_llm_response(data, response_model=None):
+    # Structured outputs come back as the model they were asked for
+    if response_model is not None and isinstance(data, dict):
+        return response_model.model_validate(data)
+    return data
+
+
+def _wrap_llm_call(original):
+    @functools.wraps(original)
+    def call(self, messages, *args, **kwargs):
+        cassette = current_cassette()
+        # Providers may delegate to their parent's call; record it only once
+        if cassette is None or getattr(_in_llm_call, "active", False):
+            return original(self, messages, *args, **kwargs)
+
+        def run():
+            _in_llm_call.active = True
+            try:
+                return original(self, messages, *args, **kwargs)
+            finally:
+                _in_llm_call.active = False
+
+        return cassette.call(
+            "llm",
+            # Prompts include dates from datetime.now(), so replays on a later
+            # day mismatch unless the crew's clock is pinned as well
+            {"model": getattr(self, "model", None), "messages": messages},
+            run,
+            encode=_encode_llm_response,
+            decode=lambda data: _decode_llm_response(data, kwargs.get("response_model")),
+        )
+
+    call._cassette_patched = True
+    return call
+
+
+def _patch_llms():
+    """Route crewai LLM calls through the active cassette.
+
+    crewai talks to most providers natively rather than through litellm, so
+    the ``call`` of every loaded LLM class is wrapped; the crew is built
+    before it runs, so its provider classes are imported by then.
+    """
+    from crewai.llms.base_llm import BaseLLM
+
+    pending = [BaseLLM]
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        original = cls.__dict__.get("call")
+        if original is not None and not getattr(original, "_cassette_patched", False):
+            cls.call = _wrap_llm_call(original)
+
+
+def _patch_litellm():
+    """Route litellm completions, used by crewai's fallback LLM, through the
+    active cassette. Installed once per process, if litellm is available."""
+    try:
+        import litellm
+    except ImportError:
+        return
+
+    if getattr(litellm.completion, "_cassette_patched", False):
+        return
+    original = litellm.completion
+
+    def completion(*args, **kwargs):
+        cassette = current_cassette()
+        if cassette is None or kwargs.get("stream") or getattr(_in_llm_call, "active", False):
+            return original(*args, **kwargs)
+        return cassette.call(
+            "llm",
+            {"model": kwargs.get("model"), "messages": kwargs.get("messages")},
+            lambda: original(*args, **kwargs),
+            encode=lambda response: response.model_dump(),
+            decode=lambda data: litellm.ModelResponse(**data),
+        )
+
+    completion._cassette_patched = True
+    litellm.completion = completion
+
+
+@contextmanager
+def use_cassette(cassette: Cassette | None):
+    """Make ``cassette`` active for the duration of a crew run"""
+    global _active_cassette
+    if cassette is None:
+        yield
+        return
+
+    _patch_llms()
+    _patch_litellm()
+    previous, _active_cassette = _active_cassette, cassette
+    try:
+        yield cassette
+    finally:
+        _active_cassette = previous
+        if cassette.mode == "record":
+            cassette.save()
@@ -0,0 +1,116 @@
+import re
+
+# Sections compile_report asks the reporter to produce
+REPORT_SECTIONS = [
+    "Executive Summary",
+    "Current Market Snapshot",
+    "Historical Trends",
+    "City Comparison",
+    "Future Outlook",
+    "Actionable Recommendations",
+]
+
+PREAMBLE = "_preamble"
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_NUMBERING = re.compile(r"^\d+[.)]\s*")
+_TABLE_SEPARATOR = re.compile(r"^\|?[\s:|-]+\|?$")
+
+
+def section_name(heading: str) -> str:
+    """Canonical name for a heading, e.g. '2. Current market snapshot'"""
+    text = _NUMBERING.sub("", heading.strip("*_ ")).strip()
+    for name in REPORT_SECTIONS:
+        if text.lower() == name.lower():
+            return name
+    return text
+
+
+def split_sections(report: str) -> list[tuple[str, str]]:
+    """Split a markdown report into (name, text) pairs at its section headings.
+
+    ``#`` and ``##`` headings always start a section, deeper ones only when
+    they name one of REPORT_SECTIONS. A leading ``#`` title that is not a
+    section name stays in the preamble with anything else before the first
+    section. Joining the texts gives back the original report.
+    """
+    sections = [(PREAMBLE, [])]
+    seen = {}
+    title_seen = False
+    for line in report.splitlines(keepends=True):
+        match = _HEADING.match(line.rstrip("\r\n"))
+        if match:
+            level, name = len(match.group(1)), section_name(match.group(2))
+            is_section = name in REPORT_SECTIONS
+            if level == 1 and not title_seen and not is_section and len(sections) == 1:
+                title_seen = True
+            elif level <= 2 or is_section:
+                seen[name] = seen.get(name, 0) + 1
+                if seen[name] > 1:
+                    name = f"{name} ({seen[name]})"
+                sections.append((name, []))
+        sections[-1][1].append(line)
+    return [(name, "".join(lines)) for name, lines in sections if lines or name != PREAMBLE]
+
+
+def table_rows(text: str) -> dict[str, str]:
+    """Data rows of every markdown table in a section, keyed by first cell"""
+    rows = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line.startswith("|") or _TABLE_SEPARATOR.match(line):
+            continue
+        key = line.strip("|").split("|")[0].strip()
+        base, count = key, 2
+        while key in rows:
+            key = f"{base} ({count})"
+            count += 1
+        rows[key] = line
+    return rows
+
+
+def diff_rows(old: str, new: str) -> dict:
+    old_rows, new_rows = table_rows(old), table_rows(new)
+    return {
+        "added": [row for key, row in new_rows.items() if key not in old_rows],
+        "removed": [key for key in old_rows if key not in new_rows],
+        "changed": [
+            {"key": key, "before": old_rows[key], "after": row}
+            for key, row in new_rows.items()
+            if key in old_rows and old_rows[key] != row
+        ],
+    }
+
+
+def diff_reports(old: str | None, new: str) -> dict:
+    """Structural diff of two reports by section and by table row.
+
+    With no previous report every section is reported as added.
+    """
+    old_sections = dict(split_sections(old)) if old is not None else {}
+    new_sections = split_sections(new)
+
+    changes, unchanged = [], []
+    for name, text in new_sections:
+        if name not in old_sections:
+            changes.append({"name": name, "status": "added", "content": text})
+        elif old_sections[name] != text:
+            changes.append({
+                "name": name,
+                "status": "changed",
+                "content": text,
+                "rows": diff_rows(old_sections[name], text)
+            })
+        else:
+            unchanged.append(name)
+
+    new_names = {name for name, _ in new_sections}
+    changes.extend(
+        {"name": name, "status": "removed"}
+        for name in old_sections if name not in new_names
+    )
+    return {
+        "order": [name for name, _ in new_sections],
+        "sections": changes,
+        "unchanged": unchanged,
+    }
@@ -0,0 +1,105 @@
+import gzip
+import hashlib
+import redis
+from app.config import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class ReportStore:
+    """Content-addressed, compressed storage for reports and stage artifacts.
+
+    Blobs live under ``reports:blob:{sha256}`` and each task keeps a small
+    ``reports:{task_id}`` hash mapping artifact names to blob digests, so the
+    Celery result and events only need to carry a reference.
+    """
+
+    def __init__(self):
+        self.redis = None
+        self.codec = "zstd" if zstandard is not None else "gzip"
+
+    def connect(self):
+        if self.redis is None:
+            self.redis = redis.Redis.from_url(settings.REPORT_STORE_URL)
+            try:
+                self.redis.ping()
+            except redis.ConnectionError:
+                self.redis = None
+                raise
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=9)
+
+    def _decompress(self, data: bytes) -> bytes:
+        # Detect the codec from the frame header so blobs written by
+        # workers with a different codec available still load
+        if data[:4] == ZSTD_MAGIC:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read this report")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def save(self, task_id: str, report: str, artifacts: dict = None) -> dict:
+        """Store the final report and per-stage artifacts, return a reference"""
+        if self.redis is None:
+            self.connect()
+        ttl = settings.REPORT_TTL_SECONDS
+        items = {"report": report}
+        items.update({f"stage:{name}": text for name, text in (artifacts or {}).items()})
+
+        index = {"codec": self.codec}
+        pipe = self.redis.pipeline()
+        for name, text in items.items():
+            raw = text.encode("utf-8")
+            digest = hashlib.sha256(raw).hexdigest()
+            # Identical content (e.g. a re-run with no changes) shares one blob
+            pipe.set(f"reports:blob:{digest}", self._compress(raw), ex=ttl)
+            index[name] = digest
+        pipe.delete(f"reports:{task_id}")
+        pipe.hset(f"reports:{task_id}", mapping=index)
+        pipe.expire(f"reports:{task_id}", ttl)
+        pipe.execute()
+
+        return {
+            "task_id": task_id,
+            "digest": index["report"],
+            "size": len(report.encode("utf-8")),
+            "stages": sorted(name[len("stage:"):] for name in index if name.startswith("stage:")),
+        }
+
+    def get_digest(self, task_id: str, name: str = "report") -> str | None:
+        if self.redis is None:
+            self.connect()
+        digest = self.redis.hget(f"reports:{task_id}", name)
+        return digest.decode("utf-8") if digest else None
+
+    def load(self, task_id: str, name: str = "report") -> str | None:
+        """Return a stored artifact as text, or None if missing or expired"""
+        digest = self.get_digest(task_id, name)
+        return self.load_version(digest) if digest else None
+
+    def load_version(self, digest: str) -> str | None:
+        """Return any stored report or artifact by its content digest"""
+        if self.redis is None:
+            self.connect()
+        blob = self.redis.get(f"reports:blob:{digest}")
+        if blob is None:
+            return None
+        return self._decompress(blob).decode("utf-8")
+
+
+def summarize_report(report: str, limit: int = 280) -> str:
+    """Short plain-text preview of a markdown report for events and results"""
+    lines = [line.strip("#*| ").strip() for line in report.splitlines()]
+    text = " ".join(line for line in lines if line)
+    return text if len(text) <= limit else text[:limit].rstrip() + "..."
+
+
+report_store = ReportStore()
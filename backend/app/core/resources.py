@@ -0,0 +1,110 @@
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+MB = 1024 * 1024
+
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # No procfs (e.g. macOS); fall back to the peak RSS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def module_name(filename: str) -> str:
+    """Top-level package an allocation site belongs to"""
+    parts = filename.replace("\\", "/").split("/")
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            index = parts.index(marker)
+            if index + 1 < len(parts):
+                return parts[index + 1].removesuffix(".py")
+    if "app" in parts:
+        return "app"
+    return "python" if "lib" in parts else parts[-1]
+
+
+class ResourceMonitor:
+    """Measures the RSS growth and CPU time of one analysis.
+
+    Setting ``trace_frames`` turns on tracemalloc as a diagnostic mode, which
+    slows every allocation down; tracing then stays on for the life of the
+    worker and only the peak is reset between analyses. It adds the traced
+    peak (``tracemalloc_peak_mb``) and the memory still held when the run
+    ends, by package (``retained_by_module``), which is not the peak.
+    """
+
+    def __init__(self, task_id: str, trace_frames: int = 0, dump_threshold_mb: int = 0, dump_dir: str = "diagnostics"):
+        self.task_id = task_id
+        self.trace_frames = trace_frames
+        self.dump_threshold_mb = dump_threshold_mb
+        self.dump_dir = dump_dir
+        self._start_snapshot = None
+
+    def start(self):
+        if self.trace_frames:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.trace_frames)
+            tracemalloc.reset_peak()
+            self._start_snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        self._rss = current_rss()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+
+    def stop(self) -> dict:
+        """Return the resource usage since ``start`` as a JSON-friendly dict"""
+        rss = current_rss()
+        usage = {
+            "rss_start_mb": round(self._rss / MB, 1),
+            "rss_end_mb": round(rss / MB, 1),
+            "rss_delta_mb": round((rss - self._rss) / MB, 1),
+            "cpu_seconds": round(time.process_time() - self._cpu, 2),
+            "wall_seconds": round(time.perf_counter() - self._wall, 2),
+        }
+
+        if self._start_snapshot is not None and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            usage["tracemalloc_peak_mb"] = round(peak / MB, 1)
+            usage["retained_by_module"] = self._retained_by_module(snapshot)
+            if self.dump_threshold_mb and usage["rss_delta_mb"] >= self.dump_threshold_mb:
+                usage["diagnostic_dump"] = self._dump(snapshot, usage)
+            self._start_snapshot = None
+
+        return usage
+
+    def _retained_by_module(self, snapshot, limit: int = 10) -> list[dict]:
+        """Memory allocated during the run and still held at its end, by package"""
+        growth = {}
+        for stat in snapshot.compare_to(self._start_snapshot, "filename"):
+            name = module_name(stat.traceback[0].filename)
+            growth[name] = growth.get(name, 0) + stat.size_diff
+        top = sorted(growth.items(), key=lambda item: item[1], reverse=True)[:limit]
+        top = [(name, round(size / MB, 2)) for name, size in top]
+        return [{"module": name, "size_mb": size} for name, size in top if size > 0]
+
+    def _dump(self, snapshot, usage: dict, limit: int = 25) -> str:
+        """Write the top allocation sites that grew during the run to a file"""
+        os.makedirs(self.dump_dir, exist_ok=True)
+        path = os.path.join(self.dump_dir, f"{self.task_id}.txt")
+        with open(path, "w") as f:
+            f.write(f"Analysis {self.task_id}: {usage}\n\n")
+            for stat in snapshot.compare_to(self._start_snapshot, "traceback")[:limit]:
+                f.write(f"{stat.size_diff / MB:+.2f} MB in {stat.count_diff:+d} blocks\n")
+                for line in stat.traceback.format():
+                    f.write(f"    {line}\n")
+        print(f"Memory growth of {usage['rss_delta_mb']} MB, allocation sites written to {path}")
+        return path
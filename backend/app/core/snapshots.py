@@ -0,0 +1,93 @@
+import hashlib
+import json
+import time
+import redis
+from app.config import settings
+
+POPULARITY_KEY = "snapshots:popularity"
+PARAMS_KEY = "snapshots:params"
+
+# Request fields that do not change the report
+IGNORED_FIELDS = {"batch_id"}
+
+
+def fingerprint(params: dict) -> str:
+    """Stable identifier for an analysis request, ignoring case and spacing"""
+    normalized = {
+        key: value.strip().lower() if isinstance(value, str) else value
+        for key, value in params.items()
+        if key not in IGNORED_FIELDS
+    }
+    raw = json.dumps(normalized, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+class SnapshotStore:
+    """Tracks how often each request is made and which completed task holds
+    the latest report for it, so popular requests can be answered instantly.
+    """
+
+    def __init__(self):
+        self.redis = None
+
+    def connect(self):
+        if self.redis is None:
+            self.redis = redis.Redis.from_url(settings.SNAPSHOT_STORE_URL)
+            try:
+                self.redis.ping()
+            except redis.ConnectionError:
+                self.redis = None
+                raise
+
+    def record_request(self, params: dict) -> str:
+        """Count a request towards its popularity and return its fingerprint"""
+        if self.redis is None:
+            self.connect()
+        key = fingerprint(params)
+        pipe = self.redis.pipeline()
+        pipe.zincrby(POPULARITY_KEY, 1, key)
+        stored = {k: v for k, v in params.items() if k not in IGNORED_FIELDS}
+        pipe.hset(PARAMS_KEY, key, json.dumps(stored))
+        pipe.execute()
+        return key
+
+    def save(self, params: dict, task_id: str):
+        """Point the request's snapshot at a freshly completed task"""
+        if self.redis is None:
+            self.connect()
+        key = f"snapshots:{fingerprint(params)}"
+        self.redis.hset(key, mapping={"task_id": task_id, "created_at": time.time()})
+        self.redis.expire(key, settings.REPORT_TTL_SECONDS)
+
+    def get_fresh(self, key: str, max_age: int = None) -> str | None:
+        """Return the task id of a snapshot younger than ``max_age`` seconds"""
+        if self.redis is None:
+            self.connect()
+        max_age = settings.SNAPSHOT_MAX_AGE_SECONDS if max_age is None else max_age
+        task_id, created_at = self.redis.hmget(f"snapshots:{key}", ["task_id", "created_at"])
+        if task_id is None or time.time() - float(created_at) > max_age:
+            return None
+        return task_id.decode("utf-8")
+
+    def hot_set(self, limit: int) -> list[tuple[str, dict]]:
+        """Most requested fingerprints with their request parameters"""
+        if self.redis is None:
+            self.connect()
+        keys = [key.decode("utf-8") for key in self.redis.zrevrange(POPULARITY_KEY, 0, limit - 1)]
+        if not keys:
+            return []
+        params = self.redis.hmget(PARAMS_KEY, keys)
+        return [(key, json.loads(value)) for key, value in zip(keys, params) if value]
+
+    def decay(self, factor: float = 0.5):
+        """Age out old popularity so the hot set follows recent traffic"""
+        if self.redis is None:
+            self.connect()
+        self.redis.zunionstore(POPULARITY_KEY, {POPULARITY_KEY: factor})
+        stale = self.redis.zrangebyscore(POPULARITY_KEY, "-inf", 0.5)
+        if stale:
+            self.redis.zrem(POPULARITY_KEY, *stale)
+            self.redis.hdel(PARAMS_KEY, *stale)
+
+
+snapshot_store = SnapshotStore()
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import time
+import redis
+import redis.asyncio as aioredis
+from collections import OrderedDict, defaultdict
+from app.config import settings
+
+TERMINAL_STATES = {"SUCCESS", "FAILURE", "REVOKED"}
+
+
+class StatusIndex:
+    """Per-task status record kept in a single ``status:{task_id}`` hash.
+
+    Workers write it on every state transition so readers can get the full
+    status in one round trip instead of querying the Celery result backend.
+    Terminal records never change again and are cached in-process.
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        self.redis = None
+        self.cache_size = cache_size
+        self._terminal = OrderedDict()
+
+    def connect(self):
+        if self.redis is None:
+            self.redis = redis.Redis.from_url(settings.STATUS_INDEX_URL)
+            try:
+                self.redis.ping()
+            except redis.ConnectionError:
+                self.redis = None
+                raise
+
+    def update(self, task_id: str, status: str, **fields):
+        """Record a state transition; extra fields are JSON-encoded"""
+        if self.redis is None:
+            self.connect()
+        mapping = {"status": status, "updated_at": time.time()}
+        mapping.update({key: json.dumps(value) for key, value in fields.items()})
+        key = f"status:{task_id}"
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping=mapping)
+        pipe.hincrby(key, "version", 1)
+        pipe.expire(key, settings.STATUS_TTL_SECONDS)
+        # Wakes up long-polling readers, see StatusNotifier
+        pipe.publish(key, status)
+        pipe.execute()
+
+    def touch(self, task_id: str):
+        """Mark a running task as alive without recording a transition"""
+        if self.redis is None:
+            self.connect()
+        self.redis.hset(f"status:{task_id}", "updated_at", time.time())
+
+    def finish(self, task_id: str, status: str, **fields):
+        """Record a terminal state unless the task already has one"""
+        record = self.get(task_id)
+        if record is None or record["status"] not in TERMINAL_STATES:
+            self.update(task_id, status, **fields)
+
+    def get(self, task_id: str) -> dict | None:
+        """Return the status record for a task, or None if it is unknown"""
+        cached = self._terminal.get(task_id)
+        if cached is not None:
+            self._terminal.move_to_end(task_id)
+            return cached
+
+        if self.redis is None:
+            self.connect()
+        raw = self.redis.hgetall(f"status:{task_id}")
+        if not raw:
+            return None
+
+        record = {}
+        for key, value in raw.items():
+            key, value = key.decode("utf-8"), value.decode("utf-8")
+            if key == "status":
+                record[key] = value
+            elif key == "version":
+                record[key] = int(value)
+            elif key == "updated_at":
+                record[key] = float(value)
+            else:
+                record[key] = json.loads(value)
+
+        if "status" not in record:
+            # Only a heartbeat was written, e.g. after the record expired
+            return None
+        if record["status"] in TERMINAL_STATES:
+            self._terminal[task_id] = record
+            if len(self._terminal) > self.cache_size:
+                self._terminal.popitem(last=False)
+        return record
+
+
+class StatusNotifier:
+    """Lets API requests wait for a task's next status transition.
+
+    A single pattern subscription on ``status:*`` per process wakes every
+    waiter, so long-polling holds no Redis connection of its own.
+    """
+
+    def __init__(self):
+        self.redis = None
+        self._waiters = defaultdict(set)
+        self._ready = None
+        self._listener = None
+
+    def start(self):
+        if self._listener is None:
+            self.redis = aioredis.from_url(settings.STATUS_INDEX_URL)
+            self._ready = asyncio.Event()
+            self._listener = asyncio.create_task(self.listen())
+
+    async def listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.psubscribe("status:*")
+                self._ready.set()
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        task_id = message["channel"].decode("utf-8")[len("status:"):]
+                        for waiter in self._waiters.get(task_id, ()):
+                            waiter.set()
+            except Exception as e:
+                print(f"Error in status subscriber: {e}")
+                self._ready.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def register(self, task_id: str) -> asyncio.Event:
+        """Start listening for a task; call before reading its current status"""
+        self.start()
+        waiter = asyncio.Event()
+        self._waiters[task_id].add(waiter)
+        return waiter
+
+    def unregister(self, task_id: str, waiter: asyncio.Event):
+        waiters = self._waiters.get(task_id)
+        if waiters is not None:
+            waiters.discard(waiter)
+            if not waiters:
+                del self._waiters[task_id]
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """Wait until the subscription is live; False on timeout"""
+        self.start()
+        return await self.wait(self._ready, timeout)
+
+    async def wait(self, waiter: asyncio.Event, timeout: float) -> bool:
+        """Wait until the event is set; False on timeout"""
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+status_index = StatusIndex()
+status_notifier = StatusNotifier()
@@ -1,24 +1,110 @@
 from crewai import Crew, Process
+import os
+import time
 from app.crew.job_market_analysis import JobMarketAnalysisCrew
 from app.core.event_bus import event_bus
+from app.core.cancellation import AnalysisCancelled, CancellationToken, find_cancellation
+from app.core.cassette import Cassette
+from app.core.resources import ResourceMonitor
+from app.config import settings
+from app.core.report_store import report_store, summarize_report
+from app.core.status_index import status_index
+from app.core.snapshots import snapshot_store
+
+# How often a running task refreshes its status record's updated_at
+STATUS_HEARTBEAT_SECONDS = 30
 
 class TaskManager:
-    def __init__(self, task_id: str, user_id: str, params: dict):
+    def __init__(self, task_id: str, user_id: str, params: dict, watch_subscribers: bool = True):
         self.task_id = task_id
         self.user_id = user_id
         self.params = params
+        self.cancellation = CancellationToken(
+            task_id,
+            deadline_seconds=settings.ANALYSIS_DEADLINE_SECONDS,
+            # Scheduled runs have nobody listening, so never treat them as abandoned
+            idle_timeout=settings.CANCEL_WITHOUT_SUBSCRIBER_SECONDS if watch_subscribers else 0,
+            batch_id=params.get("batch_id")
+        )
+        self.resources = ResourceMonitor(
+            task_id,
+            trace_frames=settings.RESOURCE_TRACE_FRAMES,
+            dump_threshold_mb=settings.RESOURCE_DUMP_THRESHOLD_MB,
+            dump_dir=settings.RESOURCE_DUMP_DIR
+        )
+        self.last_heartbeat = time.monotonic()
     
     def emit_event(self, event_type: str, data: dict):
         try:
-            event_bus.publish(self.task_id, {
-                "type": event_type,
-                "data": data
-            })
+            event = {"type": event_type, "data": data}
+            if self.params.get("batch_id"):
+                event["batch_id"] = self.params["batch_id"]
+            event_bus.publish(self.task_id, event)
         except Exception as e:
             print(f"Error emitting event: {e}")
+        self.heartbeat()
+
+    def heartbeat(self):
+        """Keep the status record fresh so readers can tell a live run from a dead worker"""
+        now = time.monotonic()
+        if now - self.last_heartbeat < STATUS_HEARTBEAT_SECONDS:
+            return
+        self.last_heartbeat = now
+        try:
+            status_index.touch(self.task_id)
+        except Exception as e:
+            print(f"Error updating task status: {e}")
+
+    def set_status(self, status: str, **fields):
+        try:
+            status_index.update(self.task_id, status, **fields)
+        except Exception as e:
+            print(f"Error updating task status: {e}")
     
+    def create_cassette(self):
+        """Cassette for recording or replaying this run, per CASSETTE_MODE"""
+        if settings.CASSETTE_MODE == "record":
+            cassette = Cassette(os.path.join(settings.CASSETTE_DIR, f"{self.task_id}.json.gz"))
+            cassette.metadata = {"task_id": self.task_id, "params": self.params}
+            return cassette
+        if settings.CASSETTE_MODE == "replay":
+            return Cassette(
+                settings.CASSETTE_REPLAY_PATH,
+                mode="replay",
+                latency=settings.CASSETTE_REPLAY_LATENCY,
+                strict=settings.CASSETTE_REPLAY_STRICT
+            )
+        return None
+
+    def store_report(self, report: str, artifacts: dict) -> dict | None:
+        try:
+            return report_store.save(self.task_id, report, artifacts)
+        except Exception as e:
+            print(f"Error storing report, keeping it inline: {e}")
+            return None
+
+    def save_snapshot(self):
+        # Replayed runs are synthetic and must never be served to users
+        if settings.CASSETTE_MODE == "replay":
+            return
+        try:
+            snapshot_store.save(self.params, self.task_id)
+        except Exception as e:
+            print(f"Error saving snapshot: {e}")
+
+    def collect_resources(self) -> dict:
+        try:
+            usage = self.resources.stop()
+        except Exception as e:
+            print(f"Error collecting resource usage: {e}")
+            return {}
+        print(f"Resource usage for {self.task_id}: {usage}")
+        return usage
+
     def run_crew(self):
         """Run the CrewAI analysis with event emission"""
+        self.set_status("STARTED")
+        self.resources.start()
         try:
             # Initialize crew with parameters
             crew = JobMarketAnalysisCrew(
@@ -29,14 +115,37 @@ class TaskManager:
                 include_salaries=self.params['include_salaries'],
                 include_companies=self.params['include_companies'],
                 include_trends=self.params['include_trends'],
-                event_callback=self.emit_event
+                event_callback=self.emit_event,
+                cancel_check=self.cancellation.check,
+                cassette=self.create_cassette()
             )
             
             # Run the crew
             self.emit_event("CREW_STARTED", {"message": "Analysis started"})
-            result = crew.run()
-            self.emit_event("CREW_COMPLETED", {"result": str(result)})
-            return {"summary": "Crew run complete", "task": "success", "result": str(result)}
+            result = str(crew.run())
+
+            # Only a reference and a short summary go to the result backend
+            # and the event bus; the report itself lives in the report store
+            summary = summarize_report(result)
+            resources = self.collect_resources()
+            report_ref = self.store_report(result, crew.stage_outputs)
+            if report_ref is None:
+                # Never lose a finished run to a store outage: keep it inline
+                self.set_status("SUCCESS", summary=summary, result=result, resources=resources)
+                self.emit_event("CREW_COMPLETED", {"summary": summary, "result": result, "resources": resources})
+                return {"summary": summary, "task": "success", "result": result, "resources": resources}
+
+            self.set_status("SUCCESS", summary=summary, report=report_ref, resources=resources)
+            self.save_snapshot()
+            self.emit_event("CREW_COMPLETED", {"summary": summary, "report": report_ref, "resources": resources})
+            return {"summary": summary, "task": "success", "report": report_ref, "resources": resources}
         except Exception as e:
+            cancelled = find_cancellation(e)
+            reason = self.cancellation.reason or (cancelled and cancelled.reason)
+            if reason:
+                self.set_status("REVOKED", error=reason, resources=self.collect_resources())
+                self.emit_event("CREW_CANCELLED", {"reason": reason})
+                raise AnalysisCancelled(reason) from e
+            self.set_status("FAILURE", error=str(e), resources=self.collect_resources())
             self.emit_event("CREW_ERROR", {"error": str(e)})
             raise
\ No newline at end of file
@@ -11,27 +11,45 @@ import requests
 from dotenv import load_dotenv
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
+from app.core.cancellation import find_cancellation
+from app.core.cassette import Cassette, current_cassette, use_cassette
 
 # Load environment variables
 load_dotenv()
 
+# Cancellation check of the crew running in this process, so that module-level
+# tools can stop at call boundaries too. This is a plain global rather than a
+# ContextVar because crewai runs time-limited agents in executor threads.
+_cancel_check: Optional[Callable] = None
+
 
 @tool
 def tavily_search(query: str) -> str:
     """Search for job market data using Tavily API"""
-    from langchain_tavily import TavilySearch
-    tavily = TavilySearch(api_key=os.getenv("TAVILY_API_KEY"))
-    end_date = str(datetime.now().strftime("%Y-%m-%d"))
-    start_date = str((datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d"))
-    return tavily.run({
-        "query": query,
-        "search_depth": "advanced",
-        "include_domains": ["linkedin.com", "indeed.com", "glassdoor.com", "naukri.com"],
-        "max_results": 15,
-        "include_answer": True,
-        "start_date":start_date,
-        "end_date":end_date
-    })
+    # crewai turns tool exceptions into an error observation for the LLM,
+    # so this only saves the search; the next agent step stops the run
+    if _cancel_check:
+        _cancel_check()
+
+    def search():
+        from langchain_tavily import TavilySearch
+        tavily = TavilySearch(api_key=os.getenv("TAVILY_API_KEY"))
+        end_date = str(datetime.now().strftime("%Y-%m-%d"))
+        start_date = str((datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d"))
+        return tavily.run({
+            "query": query,
+            "search_depth": "advanced",
+            "include_domains": ["linkedin.com", "indeed.com", "glassdoor.com", "naukri.com"],
+            "max_results": 15,
+            "include_answer": True,
+            "start_date":start_date,
+            "end_date":end_date
+        })
+
+    cassette = current_cassette()
+    if cassette:
+        return cassette.call("tavily_search", {"query": query}, search)
+    return search()
 
 @CrewBase
 class JobMarketAnalysisCrew:
@@ -54,7 +72,9 @@ class JobMarketAnalysisCrew:
         include_salaries: bool = True,
         include_companies: bool = True,
         include_trends: bool = True,
-        event_callback: Optional[Callable] = None
+        event_callback: Optional[Callable] = None,
+        cancel_check: Optional[Callable] = None,
+        cassette: Optional[Cassette] = None
     ):
         self.country = country
         self.city = city
@@ -64,6 +84,9 @@ class JobMarketAnalysisCrew:
         self.include_companies = include_companies
         self.include_trends = include_trends
         self.event_callback = event_callback
+        self.cancel_check = cancel_check
+        self.cassette = cassette
+        self.stage_outputs: Dict[str, str] = {}
         
         print(f"\nStarting analysis for {self.job_role} jobs in {self.city}, {self.country}")
         
@@ -84,9 +107,15 @@ class JobMarketAnalysisCrew:
         """Emit an event if callback is provided"""
         if self.event_callback:
             self.event_callback(event_type, data)
+
+    def check_cancelled(self):
+        """Raise if the analysis has been cancelled or ran out of time"""
+        if self.cancel_check:
+            self.cancel_check()
     
     def agent_callback(self, step_output: str, agent_name: str, task_description: str ):
         """Callback function for agent actions"""
+        self.check_cancelled()
         print(step_output,agent_name,task_description)
         self.emit_event("AGENT_ACTION", {
             "agent": agent_name,
@@ -96,6 +125,7 @@ class JobMarketAnalysisCrew:
     
     def task_callback(self, task_name: str, status: str):
         """Callback function for task status"""
+        self.check_cancelled()
         print(task_name,status)
         self.emit_event("TASK_STATUS", {
             "task": task_name,
@@ -460,17 +490,24 @@ class JobMarketAnalysisCrew:
         )
     
     def run(self) -> str:
+        global _cancel_check
+        previous_check, _cancel_check = _cancel_check, self.cancel_check
         try:
+            self.check_cancelled()
             crew_instance = self.crew()
-            result = crew_instance.kickoff()
+            with use_cassette(self.cassette):
+                result = crew_instance.kickoff()
 
-            # Emit final event
-            self.emit_event("CREW_COMPLETED", {
-                "status": "success",
-                "result": str(result)
-            })
+            # Keep per-stage outputs around for the report store; the
+            # completion event is emitted by the caller once they are saved
+            for index, output in enumerate(getattr(result, "tasks_output", None) or []):
+                name = getattr(output, "name", None) or f"task_{index + 1}"
+                self.stage_outputs[name] = str(getattr(output, "raw", output))
 
             return str(result)
         except Exception as e:
-            self.emit_event("CREW_ERROR", {"error": str(e)})
+            if find_cancellation(e) is None:
+                self.emit_event("CREW_ERROR", {"error": str(e)})
             raise
+        finally:
+            _cancel_check = previous_check
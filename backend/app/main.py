@@ -1,8 +1,10 @@
+import socketio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.analysis import router as analysis_router
 from app.api.events import router as events_router
 from app.api.auth import router as auth_router
+from app.api.sockets import event_hub
 from app.config import settings
 from app.core.event_bus import connect_event_bus
 
@@ -27,4 +29,7 @@ app.include_router(events_router, prefix="/events", tags=["events"])
 
 @app.get("/")
 def read_root():
-    return {"message": "Job Market Analysis API"}
\ No newline at end of file
+    return {"message": "Job Market Analysis API"}
+
+# Socket.IO clients connect on /socket.io, everything else goes to FastAPI
+app = socketio.ASGIApp(event_hub.sio, other_asgi_app=app)
\ No newline at end of file
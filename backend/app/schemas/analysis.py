@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class AnalysisRequest(BaseModel):
     country: str
@@ -9,12 +9,33 @@ class AnalysisRequest(BaseModel):
     include_salaries: bool = True
     include_companies: bool = True
     include_trends: bool = True
+    batch_id: Optional[str] = None
 
 class AnalysisResponse(BaseModel):
     task_id: str
+    cached: bool = False
 
 class TaskStatusResponse(BaseModel):
     task_id: str
     status: str
     result: Optional[dict] = None
-    error: Optional[str] = None
\ No newline at end of file
+    error: Optional[str] = None
+
+class RowChanges(BaseModel):
+    added: List[str] = []
+    removed: List[str] = []
+    changed: List[dict] = []
+
+class SectionChange(BaseModel):
+    name: str
+    status: str
+    content: Optional[str] = None
+    rows: Optional[RowChanges] = None
+
+class ReportDiffResponse(BaseModel):
+    task_id: str
+    version: str
+    base_version: Optional[str] = None
+    order: List[str]
+    sections: List[SectionChange]
+    unchanged: List[str] = []
@@ -1,17 +1,66 @@
-from celery import Celery
+from celery import Celery, signals, states
+from celery.schedules import crontab
+from celery.exceptions import Ignore
 from app.config import settings
+from app.core.cancellation import AnalysisCancelled
+from app.core.resources import current_rss
+from app.core.status_index import status_index
 from app.core.task_manager import TaskManager
 
 celery = Celery(
     __name__,
     broker=settings.CELERY_BROKER_URL,
-    backend=settings.CELERY_RESULT_BACKEND
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.snapshots"]
 )
+celery.conf.result_expires = settings.CELERY_RESULT_EXPIRES
+celery.conf.beat_schedule = {
+    "precompute-popular-snapshots": {
+        "task": "app.tasks.snapshots.precompute_snapshots",
+        "schedule": crontab(hour=settings.SNAPSHOT_HOUR, minute=0),
+    },
+}
+
+@signals.celeryd_init.connect
+def configure_memory_recycling(conf=None, **kwargs):
+    """Recycle pool processes once they grow WORKER_MAX_MEMORY_GROWTH_MB
+    past the memory of a freshly started worker, rather than after a fixed
+    number of tasks"""
+    if settings.WORKER_MAX_MEMORY_GROWTH_MB:
+        # Children fork from this process with the crew already imported,
+        # so its RSS is the baseline every child starts from
+        baseline_kb = current_rss() // 1024
+        conf.worker_max_memory_per_child = baseline_kb + settings.WORKER_MAX_MEMORY_GROWTH_MB * 1024
+
+@signals.task_failure.connect
+def record_task_failure(sender=None, task_id=None, exception=None, **kwargs):
+    """Record failures the task itself could not write, e.g. time limits"""
+    if sender is not None and sender.name == run_analysis_task.name:
+        try:
+            status_index.finish(task_id, "FAILURE", error=str(exception))
+        except Exception as e:
+            print(f"Error updating task status: {e}")
+
+@signals.task_revoked.connect
+def record_task_revoked(sender=None, request=None, **kwargs):
+    if sender is not None and sender.name == run_analysis_task.name:
+        try:
+            status_index.finish(request.id, "REVOKED", error="Analysis cancelled")
+        except Exception as e:
+            print(f"Error updating task status: {e}")
 
 @celery.task(bind=True)
-def run_analysis_task(self, user_id: str, params: dict):
+def run_analysis_task(self, user_id: str, params: dict, watch_subscribers: bool = True):
     """Celery task to run CrewAI analysis"""
     task_id = self.request.id
     
-    manager = TaskManager(task_id, user_id, params)
-    return manager.run_crew()
\ No newline at end of file
+    manager = TaskManager(task_id, user_id, params, watch_subscribers=watch_subscribers)
+    try:
+        return manager.run_crew()
+    except Exception as e:
+        reason = manager.cancellation.reason
+        if reason is None and not isinstance(e, AnalysisCancelled):
+            raise
+        # Free the worker right away without marking the task as failed
+        self.update_state(state=states.REVOKED, meta={"reason": reason or str(e)})
+        raise Ignore()
\ No newline at end of file
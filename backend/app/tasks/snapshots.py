@@ -0,0 +1,29 @@
+from app.config import settings
+from app.core.snapshots import snapshot_store
+from app.core.status_index import status_index
+from app.tasks.analysis import celery, run_analysis_task
+import uuid
+
+@celery.task
+def precompute_snapshots():
+    """Celery beat task to refresh reports for the most requested analyses"""
+    started = []
+    for key, params in snapshot_store.hot_set(settings.SNAPSHOT_HOT_SET_SIZE):
+        if len(started) >= settings.SNAPSHOT_MAX_RUNS:
+            break
+        # Leave recent interactive runs alone, refresh anything that would
+        # go stale before the next scheduled pass
+        if snapshot_store.get_fresh(key, max_age=settings.SNAPSHOT_MAX_AGE_SECONDS // 4):
+            continue
+
+        task_id = str(uuid.uuid4())
+        status_index.update(task_id, "PENDING")
+        run_analysis_task.apply_async(
+            args=["scheduler", params],
+            kwargs={"watch_subscribers": False},
+            task_id=task_id
+        )
+        started.append(task_id)
+
+    snapshot_store.decay()
+    return {"started": started}
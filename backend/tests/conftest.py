@@ -0,0 +1,4 @@
+import os
+
+# The crew module builds its LLM client at import time
+os.environ.setdefault("OPENAI_API_KEY", "test")
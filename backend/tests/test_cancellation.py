@@ -0,0 +1,115 @@
+import time
+import pytest
+from crewai import Agent, Crew, Task
+from crewai.llms.base_llm import BaseLLM
+from crewai.tools import tool
+from app.core import task_manager
+from app.core.cancellation import AnalysisCancelled, CancellationToken, find_cancellation
+
+
+@tool
+def echo(query: str) -> str:
+    """Echo the query back"""
+    return query
+
+
+class ScriptedLLM(BaseLLM):
+    """Alternates between a tool call and a final answer"""
+    calls: int = 0
+
+    def call(self, messages, *args, **kwargs):
+        self.calls += 1
+        if self.calls % 2:
+            return 'Thought: search first\nAction: echo\nAction Input: {"query": "jobs"}'
+        return "Thought: I now know the final answer\nFinal Answer: done"
+
+    def supports_function_calling(self):
+        return False
+
+
+def expired_token():
+    token = CancellationToken("task-1", deadline_seconds=60)
+    token.deadline = time.monotonic() - 1
+    return token
+
+
+def test_cancel_raised_through_time_limited_agent():
+    token = expired_token()
+    llm = ScriptedLLM(model="scripted")
+    agent = Agent(
+        role="Researcher",
+        goal="Research",
+        backstory="Researcher",
+        llm=llm,
+        tools=[echo],
+        max_iter=3,
+        max_execution_time=30,
+        step_callback=lambda step: token.check()
+    )
+    task = Task(description="Research jobs", expected_output="Summary", agent=agent)
+
+    with pytest.raises(Exception) as exc_info:
+        Crew(agents=[agent], tasks=[task]).kickoff()
+
+    assert token.reason == "Analysis deadline exceeded"
+    assert find_cancellation(exc_info.value) is not None
+    # The run stops at the first step instead of being retried
+    assert llm.calls == 1
+
+
+def test_tripped_token_keeps_raising():
+    token = expired_token()
+    for _ in range(2):
+        with pytest.raises(AnalysisCancelled):
+            token.check()
+    assert token.reason == "Analysis deadline exceeded"
+
+
+def test_find_cancellation_follows_wrapped_errors():
+    try:
+        try:
+            raise AnalysisCancelled("Analysis cancelled")
+        except AnalysisCancelled as e:
+            raise RuntimeError("Task execution failed: Analysis cancelled") from e
+    except RuntimeError as e:
+        assert find_cancellation(e).reason == "Analysis cancelled"
+
+    assert find_cancellation(RuntimeError("boom")) is None
+
+
+def test_run_crew_reports_wrapped_cancellation(monkeypatch):
+    events = []
+
+    class WrappingCrew:
+        """Stands in for the crew, wrapping the cancel like crewai used to"""
+        stage_outputs = {}
+
+        def __init__(self, cancel_check=None, **kwargs):
+            self.cancel_check = cancel_check
+
+        def run(self):
+            try:
+                self.cancel_check()
+            except Exception as e:
+                raise RuntimeError(f"Task execution failed: {e}") from e
+
+    monkeypatch.setattr(task_manager, "JobMarketAnalysisCrew", WrappingCrew)
+    manager = task_manager.TaskManager("task-1", "anonymous", {
+        "country": "India",
+        "city": "Bangalore",
+        "job_role": "Software Engineer",
+        "include_skills": True,
+        "include_salaries": True,
+        "include_companies": True,
+        "include_trends": True,
+    })
+    manager.cancellation.deadline = time.monotonic() - 1
+    monkeypatch.setattr(manager, "emit_event", lambda event_type, data: events.append(event_type))
+    monkeypatch.setattr(manager, "set_status", lambda status, **fields: events.append(status))
+
+    with pytest.raises(AnalysisCancelled):
+        manager.run_crew()
+
+    assert "REVOKED" in events
+    assert "CREW_CANCELLED" in events
+    assert "CREW_ERROR" not in events
@@ -0,0 +1,91 @@
+import pytest
+from crewai.llms.base_llm import BaseLLM
+from crewai.agents.crew_agent_executor import CrewAgentExecutor
+from crewai.utilities.agent_utils import extract_tool_call_info
+from openai.types.chat import ChatCompletionMessageToolCall
+from app.core.cassette import Cassette, CassetteError, use_cassette
+
+
+def record(path):
+    cassette = Cassette(str(path))
+    cassette.call("tavily_search", {"query": "python jobs"}, lambda: "results")
+    cassette.save()
+
+
+def test_replay_returns_recorded_response(tmp_path):
+    path = tmp_path / "run.json.gz"
+    record(path)
+
+    replay = Cassette(str(path), mode="replay")
+    assert replay.call("tavily_search", {"query": "python jobs"}, None) == "results"
+    assert replay.mismatches == 0
+    with pytest.raises(CassetteError):
+        replay.call("tavily_search", {"query": "python jobs"}, None)
+
+
+def test_replay_reports_mismatched_request(tmp_path, capsys):
+    path = tmp_path / "run.json.gz"
+    record(path)
+
+    replay = Cassette(str(path), mode="replay")
+    assert replay.call("tavily_search", {"query": "java jobs"}, None) == "results"
+    assert replay.mismatches == 1
+    assert "does not match" in capsys.readouterr().out
+
+
+def test_strict_replay_rejects_mismatched_request(tmp_path):
+    path = tmp_path / "run.json.gz"
+    record(path)
+
+    replay = Cassette(str(path), mode="replay", strict=True)
+    with pytest.raises(CassetteError):
+        replay.call("tavily_search", {"query": "java jobs"}, None)
+
+
+class CountingLLM(BaseLLM):
+    calls: int = 0
+
+    def call(self, messages, *args, **kwargs):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+def test_llm_calls_are_recorded_and_replayed(tmp_path):
+    path = str(tmp_path / "run.json.gz")
+    llm = CountingLLM(model="counting")
+    with use_cassette(Cassette(path)):
+        assert llm.call("hello") == "answer 1"
+
+    with use_cassette(Cassette(path, mode="replay", strict=True)) as replay:
+        assert llm.call("hello") == "answer 1"
+    # Served from the cassette without calling the model again
+    assert llm.calls == 1
+    assert replay.mismatches == 0
+
+
+class ToolCallingLLM(BaseLLM):
+    """Answers like a native function-calling provider"""
+    calls: int = 0
+
+    def call(self, messages, *args, **kwargs):
+        self.calls += 1
+        return [ChatCompletionMessageToolCall(
+            id="call_1",
+            type="function",
+            function={"name": "tavily_search", "arguments": '{"query": "python jobs"}'},
+        )]
+
+
+def test_tool_calls_are_replayed_as_tool_calls(tmp_path):
+    path = str(tmp_path / "run.json.gz")
+    llm = ToolCallingLLM(model="tools")
+    with use_cassette(Cassette(path)):
+        recorded = llm.call("hello")
+
+    with use_cassette(Cassette(path, mode="replay", strict=True)):
+        replayed = llm.call("hello")
+    assert llm.calls == 1
+
+    executor = CrewAgentExecutor.__new__(CrewAgentExecutor)
+    assert executor._is_tool_call_list(replayed)
+    assert extract_tool_call_info(replayed[0]) == extract_tool_call_info(recorded[0])
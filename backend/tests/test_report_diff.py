@@ -0,0 +1,59 @@
+from app.core.report_diff import PREAMBLE, diff_reports, split_sections
+
+REPORT = """# Job Market Report
+Generated today
+
+## 1. Executive Summary
+Demand is strong.
+
+## Current Market Snapshot
+| Skill | Demand |
+|-------|--------|
+| Python | High |
+| Go | Medium |
+"""
+
+
+def names(report):
+    return [name for name, _ in split_sections(report)]
+
+
+def test_split_round_trips():
+    assert names(REPORT) == [PREAMBLE, "Executive Summary", "Current Market Snapshot"]
+    assert "".join(text for _, text in split_sections(REPORT)) == REPORT
+
+
+def test_split_on_h1_sections():
+    report = "# Report\n# Executive Summary\nA\n# Future Outlook\nB\n"
+    assert names(report) == [PREAMBLE, "Executive Summary", "Future Outlook"]
+
+
+def test_h1_section_is_not_a_title():
+    report = "# Executive Summary\nA\n# Future Outlook\nB\n"
+    assert names(report) == ["Executive Summary", "Future Outlook"]
+
+
+def test_split_on_deeper_section_headings():
+    report = "# Report\n### Executive Summary\nA\n### Details\nB\n### Future Outlook\nC\n"
+    sections = split_sections(report)
+    assert [name for name, _ in sections] == [PREAMBLE, "Executive Summary", "Future Outlook"]
+    assert "### Details" in dict(sections)["Executive Summary"]
+
+
+def test_diff_reports_rows():
+    new = REPORT.replace("| Go | Medium |", "| Go | High |") + "| Rust | Low |\n"
+    diff = diff_reports(REPORT, new)
+
+    assert diff["unchanged"] == [PREAMBLE, "Executive Summary"]
+    [section] = diff["sections"]
+    assert section["name"] == "Current Market Snapshot"
+    assert section["status"] == "changed"
+    assert section["rows"]["added"] == ["| Rust | Low |"]
+    assert [change["key"] for change in section["rows"]["changed"]] == ["Go"]
+    assert section["rows"]["removed"] == []
+
+
+def test_diff_without_previous_report():
+    diff = diff_reports(None, REPORT)
+    assert {section["status"] for section in diff["sections"]} == {"added"}
+    assert diff["order"] == names(REPORT)
@@ -0,0 +1,27 @@
+import tracemalloc
+from app.core.resources import ResourceMonitor
+
+
+def test_default_accounting_does_not_trace():
+    was_tracing = tracemalloc.is_tracing()
+    monitor = ResourceMonitor("task-1")
+    monitor.start()
+    usage = monitor.stop()
+
+    assert tracemalloc.is_tracing() == was_tracing
+    assert {"rss_delta_mb", "cpu_seconds", "wall_seconds"} <= set(usage)
+    assert "retained_by_module" not in usage
+
+
+def test_diagnostic_mode_reports_retained_memory():
+    monitor = ResourceMonitor("task-1", trace_frames=1)
+    try:
+        monitor.start()
+        retained = [bytearray(1024 * 1024) for _ in range(4)]
+        usage = monitor.stop()
+    finally:
+        tracemalloc.stop()
+
+    assert usage["tracemalloc_peak_mb"] >= 4
+    assert any(entry["size_mb"] >= 4 for entry in usage["retained_by_module"])
+    del retained
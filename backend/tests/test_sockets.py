@@ -0,0 +1,35 @@
+import asyncio
+import pytest
+from app.api.sockets import EventHub
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    hub = EventHub()
+    monkeypatch.setattr(hub, "start", lambda: None)
+    return hub
+
+
+@pytest.mark.parametrize("data", [
+    None,
+    "task-1",
+    {"task_ids": "task-1"},
+    {"task_ids": [1]},
+    {"batch_ids": [["batch-1"]]},
+    {"task_ids": ["task-1"], "types": "CREW_COMPLETED"},
+])
+def test_malformed_subscribe_is_rejected(hub, data):
+    ack = asyncio.run(hub.subscribe("sid", data))
+    assert "error" in ack
+    assert not hub.subscriptions
+    assert "error" in asyncio.run(hub.unsubscribe("sid", data))
+
+
+def test_subscribe_and_unsubscribe(hub):
+    ack = asyncio.run(hub.subscribe("sid", {"task_ids": ["t1"], "batch_ids": ["b1"], "types": ["CREW_COMPLETED"]}))
+    assert ack == {"subscribed": ["task:t1", "batch:b1"]}
+    assert hub.subscriptions["task:t1"] == {"sid": {"CREW_COMPLETED"}}
+
+    asyncio.run(hub.unsubscribe("sid", {"task_ids": ["t1"]}))
+    assert "task:t1" not in hub.subscriptions
+    assert hub.subscriptions["batch:b1"] == {"sid": {"CREW_COMPLETED"}}
@@ -0,0 +1,41 @@
+import pytest
+import redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import analysis
+
+REPORT_REF = {"task_id": "task-1", "digest": "abc", "size": 10, "stages": []}
+
+
+def fail(*args, **kwargs):
+    raise redis.ConnectionError("Redis is down")
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(analysis.router, prefix="/analysis")
+    return TestClient(app)
+
+
+def test_status_falls_back_to_celery_when_index_fails(client, monkeypatch):
+    monkeypatch.setattr(analysis.status_index, "get", fail)
+    monkeypatch.setattr(analysis, "get_celery_record", lambda task_id: {"status": "STARTED"})
+
+    response = client.get("/analysis/status/task-1")
+    assert response.status_code == 200
+    assert response.json()["status"] == "STARTED"
+
+
+def test_status_reports_unavailable_report(client, monkeypatch):
+    record = {"status": "SUCCESS", "summary": "done", "report": REPORT_REF}
+    monkeypatch.setattr(analysis.status_index, "get", lambda task_id: record)
+    monkeypatch.setattr(analysis.report_store, "load", fail)
+
+    response = client.get("/analysis/status/task-1")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "SUCCESS"
+    assert data["error"] == "Report is temporarily unavailable"
+    assert data["result"]["report"]["digest"] == "abc"
+    assert "etag" not in response.headers
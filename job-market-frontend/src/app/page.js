@@ -42,6 +42,9 @@ export default function JobMarketAnalysis() {
   const reportRef = useRef(null);
 
   const eventSourceRef = useRef(null);
+  const reportSectionsRef = useRef({});
+  const reportVersionRef = useRef(null);
+  const [changedSections, setChangedSections] = useState([]);
 
   const handleChange = (e) => {
     const { name, value, type, checked } = e.target;
@@ -85,13 +88,61 @@ export default function JobMarketAnalysis() {
 
       const data = await response.json();
       setTaskId(data.task_id);
-      connectToSSE(data.task_id);
+      if (data.cached) {
+        await fetchReport(data.task_id);
+        setIsAnalyzing(false);
+      } else {
+        connectToSSE(data.task_id);
+      }
     } catch (err) {
       setError("Failed to start analysis. Please try again.");
       setIsAnalyzing(false);
     }
   };
 
+  const fetchReport = async (taskId) => {
+    try {
+      // Only sections that changed since the report we already have are sent
+      const since = reportVersionRef.current;
+      const response = await fetch(
+        `http://127.0.0.1:8000/analysis/report/${taskId}` +
+          (since ? `?since=${since}` : "")
+      );
+      if (!response.ok) {
+        setError("Report is not available.");
+        return;
+      }
+      const data = await response.json();
+      const sections = data.base_version ? { ...reportSectionsRef.current } : {};
+      data.sections.forEach((section) => {
+        if (section.status === "removed") {
+          delete sections[section.name];
+        } else {
+          sections[section.name] = section.content;
+        }
+      });
+      reportSectionsRef.current = sections;
+      reportVersionRef.current = data.version;
+      setChangedSections(
+        data.base_version
+          ? data.sections.filter((s) => s.status !== "removed").map((s) => s.name)
+          : []
+      );
+
+      showReport(data.order.map((name) => sections[name] || "").join(""));
+    } catch (err) {
+      setError("Failed to load report. Please try again.");
+    }
+  };
+
+  const showReport = (report) => {
+    const cleanedResult = report.startsWith("**")
+      ? report.substring(2)
+      : report;
+    setReport(cleanedResult);
+    extractChartData(cleanedResult);
+  };
+
   const connectToSSE = (taskId) => {
     if (eventSourceRef.current) {
       eventSourceRef.current.close();
@@ -142,11 +193,12 @@ export default function JobMarketAnalysis() {
             break;  
 
           case "CREW_COMPLETED":
-            const cleanedResult = data.data.result.startsWith("**") 
-              ? data.data.result.substring(2) 
-              : data.data.result;
-            setReport(cleanedResult);
-            extractChartData(cleanedResult);
+            if (data.data.result) {
+              // The report could not be stored and was sent inline
+              showReport(data.data.result);
+            } else {
+              fetchReport(taskId);
+            }
             setProgress((prev) => [
               ...prev,
               {
@@ -158,6 +210,19 @@ export default function JobMarketAnalysis() {
             eventSource.close();
             break;
 
+          case "CREW_CANCELLED":
+            setError(data.data.reason);
+            setProgress((prev) => [
+              ...prev,
+              {
+                type: "error",
+                message: `Cancelled: ${data.data.reason}`,
+              },
+            ]);
+            setIsAnalyzing(false);
+            eventSource.close();
+            break;
+
           case "CREW_ERROR":
             setError(data.data.error);
             setProgress((prev) => [
@@ -597,6 +662,16 @@ export default function JobMarketAnalysis() {
               }}>
                   {report ? (
                     <div className="space-y-6">
+                      {reportVersionRef.current && changedSections.length > 0 && (
+                        <div className="flex flex-wrap items-center gap-2">
+                          <span className="text-sm font-medium">What changed:</span>
+                          {changedSections.map((name) => (
+                            <Badge key={name} variant="secondary">
+                              {name === "_preamble" ? "Title" : name}
+                            </Badge>
+                          ))}
+                        </div>
+                      )}
                       <div className="prose max-w-none">
                         <ReactMarkdown 
                           remarkPlugins={[remarkGfm]} 